@@ -97,10 +97,13 @@ class BaseSoC(SoCCore):
         self.add_memory_region("rom", self.mem_map["spiflash"] + bios_flash_offset, 32*kB, type="cached+linker")
 
         # Leds -------------------------------------------------------------------------------------
-        counter = Signal(32)
+        # Free-running counter tapped at its MSB: the blink is a single flop tap (no comparator/
+        # reload), the counter is no wider than the tapped bit, and its width is derived from
+        # sys_clk_freq at Python time so the ~1 Hz rate survives clock-frequency changes.
+        counter = Signal(log2_int(int(sys_clk_freq), need_pow2=False))
         self.sync += counter.eq(counter + 1)
-        self.comb += platform.request("user_ledr_n").eq(counter[26])
-        self.comb += platform.request("user_ledg_n").eq(~counter[26])
+        self.comb += platform.request("user_ledr_n").eq(counter[-1])
+        self.comb += platform.request("user_ledg_n").eq(~counter[-1])
 
 # Flash --------------------------------------------------------------------------------------------
 
@@ -82,11 +82,14 @@ class PlatformInfo:
         return "{}({})".format(self.__class__.__name__, repr(self.info))
 
 
-def _lookup(description, name, number):
+def _lookup(description, name, number, loose=False):
     for resource in description:
         if resource[0] == name and (number is None or resource[1] == number):
             return resource
-    raise ConstraintError("Resource not found: {}:{}".format(name, number))
+    if loose:
+        return None
+    else:
+        raise ConstraintError("Resource not found: {}:{}".format(name, number))
 
 
 def _resource_type(resource):
@@ -178,8 +181,45 @@ class ConstraintManager:
     def add_extension(self, io):
         self.available.extend(io)
 
-    def request(self, name, number=None):
-        resource = _lookup(self.available, name, number)
+    def request(self, name, number=None, loose=False):
+        resource = _lookup(self.available, name, number, loose)
+        if resource is None:
+            return None
+        return self._request(resource, name, number)
+
+    def request_many(self, names):
+        """Request several resources with a single scan of the constraint list.
+
+        names is a list of name or (name, number) entries; returns a dict mapping each entry
+        to its pads.
+        """
+        wanted = {}
+        for item in names:
+            name, number = item if isinstance(item, tuple) else (item, None)
+            wanted[item] = (name, number)
+        r = {}
+        for resource in list(self.available):
+            for item, (name, number) in wanted.items():
+                if item in r:
+                    continue
+                if resource[0] == name and (number is None or resource[1] == number):
+                    r[item] = self._request(resource, name, number)
+                    break
+        missing = [item for item in wanted if item not in r]
+        if missing:
+            raise ConstraintError("Resources not found: {}".format(missing))
+        return r
+
+    def request_all(self, name):
+        """Request every still-available instance of a resource with a single scan.
+
+        Returns the pads as a list ordered by resource number.
+        """
+        matches = sorted((r for r in self.available if r[0] == name),
+                         key=lambda r: (r[1] is not None, r[1]))
+        return [self._request(resource, name, resource[1]) for resource in matches]
+
+    def _request(self, resource, name, number):
         rt, ri = _resource_type(resource)
         if number is None:
             resource_name = name
@@ -205,13 +245,16 @@ class ConstraintManager:
         self.matched.append((resource, obj))
         return obj
 
-    def lookup_request(self, name, number=None):
+    def lookup_request(self, name, number=None, loose=False):
         for resource, obj in self.matched:
             if resource[0] == name and (number is None or
                                         resource[1] == number):
                 return obj
 
-        raise ConstraintError("Resource not found: {}:{}".format(name, number))
+        if loose:
+            return None
+        else:
+            raise ConstraintError("Resource not found: {}:{}".format(name, number))
 
     def add_platform_command(self, command, **signals):
         self.platform_commands.append((command, signals))
@@ -267,6 +310,7 @@ class GenericPlatform:
             name = self.__module__.split(".")[-1]
         self.name = name
         self.sources = []
+        self.source_paths = set()
         self.verilog_include_paths = []
         self.output_dir = None
         self.finalized = False
@@ -274,6 +318,12 @@ class GenericPlatform:
     def request(self, *args, **kwargs):
         return self.constraint_manager.request(*args, **kwargs)
 
+    def request_many(self, *args, **kwargs):
+        return self.constraint_manager.request_many(*args, **kwargs)
+
+    def request_all(self, *args, **kwargs):
+        return self.constraint_manager.request_all(*args, **kwargs)
+
     def lookup_request(self, *args, **kwargs):
         return self.constraint_manager.lookup_request(*args, **kwargs)
 
@@ -313,22 +363,20 @@ class GenericPlatform:
         """overload this and e.g. add_platform_command()'s after the modules
         had their say"""
         if hasattr(self, "default_clk_period"):
-            try:
-                self.add_period_constraint(
-                    self.lookup_request(self.default_clk_name),
-                    self.default_clk_period)
-            except ConstraintError:
-                pass
+            default_clk = self.lookup_request(self.default_clk_name, loose=True)
+            if default_clk is not None:
+                self.add_period_constraint(default_clk, self.default_clk_period)
 
     def add_source(self, filename, language=None, library=None):
+        filename = os.path.abspath(filename)
+        if filename in self.source_paths:
+            return
         if language is None:
             language = tools.language_by_filename(filename)
         if library is None:
             library = "work"
-        for f, _, _ in self.sources:
-            if f == filename:
-                return
-        self.sources.append((os.path.abspath(filename), language, library))
+        self.source_paths.add(filename)
+        self.sources.append((filename, language, library))
 
     def add_sources(self, path, *filenames, language=None, library=None):
         for f in filenames:
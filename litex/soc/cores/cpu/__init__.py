@@ -2,11 +2,15 @@
 # This file is Copyright (c) 2015-2019 Florent Kermarrec <florent@enjoy-digital.fr>
 # License: BSD
 
+from types import MappingProxyType
+
 from migen import *
 
 # CPU ----------------------------------------------------------------------------------------------
 
 class CPU(Module):
+    # Note: data_width/endianness/linker_output_format must agree with gcc_triple: a mismatched
+    # linker format makes the link stage pick the wrong emulation and fails late in the build.
     name                 = None
     data_width           = None
     endianness           = None
@@ -41,7 +45,9 @@ from litex.soc.cores.cpu.microwatt import Microwatt
 from litex.soc.cores.cpu.blackparrot import BlackParrotRV64
 from litex.soc.cores.cpu.serv import SERV
 
-CPUS = {
+# Read-only view: the lookup tables below are shared module-level state consulted on every SoC
+# construction; freezing them avoids accidental mutation from user scripts.
+CPUS = MappingProxyType({
     "None"        : CPUNone,
     "lm32"        : LM32,
     "mor1kx"      : MOR1KX,
@@ -52,21 +58,21 @@ CPUS = {
     "microwatt"   : Microwatt,
     "blackparrot" : BlackParrotRV64,
     "serv"        : SERV
-}
+})
 
 # CPU Variants/Extensions Definition ---------------------------------------------------------------
 
-CPU_VARIANTS = {
-    # "official name": ["alias 1", "alias 2"],
-    "minimal" : ["min",],
-    "lite" : ["light", "zephyr", "nuttx"],
-    "standard": [None, "std"],
-    "full": [],
-    "linux" : [],
-    "linuxd" : [],
-    "linuxq" : [],
-}
-CPU_VARIANTS_EXTENSIONS = ["debug", "no-dsp"]
+CPU_VARIANTS = MappingProxyType({
+    # "official name": ("alias 1", "alias 2"),
+    "minimal" : ("min",),
+    "lite" : ("light", "zephyr", "nuttx"),
+    "standard": (None, "std"),
+    "full": (),
+    "linux" : (),
+    "linuxd" : (),
+    "linuxq" : (),
+})
+CPU_VARIANTS_EXTENSIONS = ("debug", "no-dsp")
 
 
 class InvalidCPUVariantError(ValueError):
@@ -105,7 +111,7 @@ def check_format_cpu_variant(variant):
     # Check for valid CPU variants.
     processor, *extensions = variant.split('+')
     for k, v in CPU_VARIANTS.items():
-        if processor not in [k,]+v:
+        if processor not in (k, *v):
             continue
         _variant = k
         break
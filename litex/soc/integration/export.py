@@ -118,8 +118,13 @@ def get_mem_header(regions):
     r = generated_banner("//")
     r += "#ifndef __GENERATED_MEM_H\n#define __GENERATED_MEM_H\n\n"
     for name, region in regions.items():
-        r += "#define {name}_BASE 0x{base:08x}L\n#define {name}_SIZE 0x{size:08x}\n\n".format(
+        r += "#define {name}_BASE 0x{base:08x}L\n#define {name}_SIZE 0x{size:08x}\n".format(
             name=name.upper(), base=region.origin, size=region.length)
+        # Expose cacheability so software can pick cached accessors/mappings for memory-like
+        # regions and uncached ones for IO.
+        if not getattr(region, "cached", True):
+            r += "#define {name}_NONCACHED\n".format(name=name.upper())
+        r += "\n"
     r += "#endif\n"
     return r
 
@@ -192,35 +197,37 @@ def _get_rw_functions_c(reg_name, reg_base, nwords, busword, alignment, read_onl
 
 def get_csr_header(regions, constants, with_access_functions=True):
     alignment = constants.get("CONFIG_CSR_ALIGNMENT", 32)
-    r = generated_banner("//")
+    # Build the header as a list of fragments joined once: cheaper than repeated string
+    # concatenation on SoCs with many CSRs and called for every generated header flavor.
+    r = [generated_banner("//")]
     if with_access_functions: # FIXME
-        r += "#include <generated/soc.h>\n"
-    r += "#ifndef __GENERATED_CSR_H\n#define __GENERATED_CSR_H\n"
+        r.append("#include <generated/soc.h>\n")
+    r.append("#ifndef __GENERATED_CSR_H\n#define __GENERATED_CSR_H\n")
     if with_access_functions:
-        r += "#include <stdint.h>\n"
-        r += "#ifdef CSR_ACCESSORS_DEFINED\n"
-        r += "extern void csr_write_simple(unsigned long v, unsigned long a);\n"
-        r += "extern unsigned long csr_read_simple(unsigned long a);\n"
-        r += "#else /* ! CSR_ACCESSORS_DEFINED */\n"
-        r += "#include <hw/common.h>\n"
-        r += "#endif /* ! CSR_ACCESSORS_DEFINED */\n"
+        r.append("#include <stdint.h>\n")
+        r.append("#ifdef CSR_ACCESSORS_DEFINED\n")
+        r.append("extern void csr_write_simple(unsigned long v, unsigned long a);\n")
+        r.append("extern unsigned long csr_read_simple(unsigned long a);\n")
+        r.append("#else /* ! CSR_ACCESSORS_DEFINED */\n")
+        r.append("#include <hw/common.h>\n")
+        r.append("#endif /* ! CSR_ACCESSORS_DEFINED */\n")
     for name, region in regions.items():
         origin = region.origin
-        r += "\n/* "+name+" */\n"
-        r += "#define CSR_"+name.upper()+"_BASE "+hex(origin)+"L\n"
+        r.append("\n/* "+name+" */\n")
+        r.append("#define CSR_"+name.upper()+"_BASE "+hex(origin)+"L\n")
         if not isinstance(region.obj, Memory):
             for csr in region.obj:
                 nr = (csr.size + region.busword - 1)//region.busword
-                r += _get_rw_functions_c(name + "_" + csr.name, origin, nr, region.busword, alignment,
-                    isinstance(csr, CSRStatus), with_access_functions)
+                r.append(_get_rw_functions_c(name + "_" + csr.name, origin, nr, region.busword, alignment,
+                    isinstance(csr, CSRStatus), with_access_functions))
                 origin += alignment//8*nr
                 if hasattr(csr, "fields"):
                     for field in csr.fields.fields:
-                        r += "#define CSR_"+name.upper()+"_"+csr.name.upper()+"_"+field.name.upper()+"_OFFSET "+str(field.offset)+"\n"
-                        r += "#define CSR_"+name.upper()+"_"+csr.name.upper()+"_"+field.name.upper()+"_SIZE "+str(field.size)+"\n"
+                        r.append("#define CSR_"+name.upper()+"_"+csr.name.upper()+"_"+field.name.upper()+"_OFFSET "+str(field.offset)+"\n")
+                        r.append("#define CSR_"+name.upper()+"_"+csr.name.upper()+"_"+field.name.upper()+"_SIZE "+str(field.size)+"\n")
 
-    r += "\n#endif\n"
-    return r
+    r.append("\n#endif\n")
+    return "".join(r)
 
 # JSON Export --------------------------------------------------------------------------------------
 
@@ -282,7 +282,29 @@ class SoCBusHandler(Module):
         return is_io
 
     # Add Master/Slave -----------------------------------------------------------------------------
-    def add_adapter(self, name, interface):
+    def add_adapter(self, name, interface, direction="m2s"):
+        assert direction in ["m2s", "s2m"]
+        # Bridge AXI/AXI-Lite interfaces natively so masters/slaves can be connected without the
+        # caller instantiating its own Wishbone converter.
+        if isinstance(interface, (axi.AXIInterface, axi.AXILiteInterface)):
+            self.logger.info("{} Bus {} to {}.".format(
+                colorer(name),
+                colorer("bridged", color="cyan"),
+                colorer("Wishbone")))
+            adr_width     = interface.address_width - interface.adr_shift
+            new_interface = wishbone.Interface(data_width=interface.data_width, adr_width=adr_width)
+            if direction == "m2s":
+                if isinstance(interface, axi.AXIInterface):
+                    bridge = axi.AXI2Wishbone(interface, new_interface)
+                else:
+                    bridge = axi.AXILite2Wishbone(interface, new_interface)
+            else:
+                if isinstance(interface, axi.AXIInterface):
+                    bridge = axi.Wishbone2AXI(new_interface, interface)
+                else:
+                    bridge = axi.Wishbone2AXILite(new_interface, interface)
+            self.submodules += bridge
+            interface = new_interface
         if interface.data_width != self.data_width:
             self.logger.info("{} Bus {} from {}-bit to {}-bit.".format(
                 colorer(name),
@@ -304,7 +326,7 @@ class SoCBusHandler(Module):
                 colorer("already declared", color="red")))
             self.logger.error(self)
             raise
-        master = self.add_adapter(name, master)
+        master = self.add_adapter(name, master, direction="m2s")
         self.masters[name] = master
         self.logger.info("{} {} as Bus Master.".format(
             colorer(name,    color="underline"),
@@ -336,7 +358,7 @@ class SoCBusHandler(Module):
                 colorer("already declared", color="red")))
             self.logger.error(self)
             raise
-        slave = self.add_adapter(name, slave)
+        slave = self.add_adapter(name, slave, direction="s2m")
         self.slaves[name] = slave
         self.logger.info("{} {} as Bus Slave.".format(
             colorer(name, color="underline"),
@@ -1035,15 +1057,31 @@ class LiteXSoC(SoC):
                             axi          = self.cpu.mem_axi,
                             port         = port,
                             base_address = self.bus.regions["main_ram"].origin)
-                    # If different data_width, do the adaptation and connect it via Wishbone.
+                    # If narrower CPU data_width, do the up-conversion natively in AXI.
+                    elif port.data_width > mem_bus.data_width:
+                        self.logger.info("Converting MEM data width: {} to {} via AXI".format(
+                            mem_bus.data_width,
+                            port.data_width))
+                        mem_axi = axi.AXIInterface(
+                            data_width    = port.data_width,
+                            address_width = self.cpu.mem_axi.address_width,
+                            id_width      = self.cpu.mem_axi.id_width)
+                        self.submodules += axi.AXIUpConverter(
+                            axi_from = self.cpu.mem_axi,
+                            axi_to   = mem_axi)
+                        self.submodules += LiteDRAMAXI2Native(
+                            axi          = mem_axi,
+                            port         = port,
+                            base_address = self.bus.regions["main_ram"].origin)
+                    # Else do the down-conversion and connect it via Wishbone.
                     else:
                         self.logger.info("Converting MEM data width: {} to {} via Wishbone".format(
                             port.data_width,
                             self.cpu.mem_axi.data_width))
-                        # FIXME: replace WB data-width converter with native AXI converter!!!
+                        # FIXME: replace WB data-width down-converter with native AXI converter!!!
                         mem_wb  = wishbone.Interface(
                             data_width = self.cpu.mem_axi.data_width,
-                            adr_width  = 32-log2_int(self.cpu.mem_axi.data_width//8))
+                            adr_width  = 32-self.cpu.mem_axi.adr_shift)
                         # NOTE: AXI2Wishbone FSMs must be reset with the CPU!
                         mem_a2w = ResetInserter()(axi.AXI2Wishbone(
                             axi          = self.cpu.mem_axi,
@@ -302,13 +302,17 @@ def soc_core_args(parser):
     parser.add_argument("--no-ctrl", action="store_true",
                         help="Disable Controller (default=False)")
 
+# SoCCore.__init__ parameter names, resolved once at import (getargspec re-parses the code
+# object on every call and is deprecated).
+_soc_core_args = tuple(inspect.signature(SoCCore.__init__).parameters)
+
 def soc_core_argdict(args):
     r = dict()
     rom_file = getattr(args, "integrated_rom_file", None)
     if rom_file is not None:
         args.integrated_rom_init = get_mem_data(rom_file, "little") # FIXME: endianness
         args.integrated_rom_size = len(args.integrated_rom_init)*4
-    for a in inspect.getargspec(SoCCore.__init__).args:
+    for a in _soc_core_args:
         if a not in ["self", "platform"]:
             if a in ["with_uart", "with_timer", "with_ctrl"]:
                 arg = not getattr(args, a.replace("with", "no"), True)
@@ -62,9 +62,12 @@ def soc_sdram_args(parser):
     parser.add_argument("--max-sdram-size", default=0x40000000, type=auto_int,
                         help="Maximum SDRAM size mapped to the SoC (default=1GB))")
 
+# SoCSDRAM.__init__ parameter names, resolved once at import.
+_soc_sdram_args = tuple(inspect.signature(SoCSDRAM.__init__).parameters)
+
 def soc_sdram_argdict(args):
     r = soc_core_argdict(args)
-    for a in inspect.getargspec(SoCSDRAM.__init__).args:
+    for a in _soc_sdram_args:
         if a not in ["self", "platform", "clk_freq"]:
             arg = getattr(args, a, None)
             if arg is not None:
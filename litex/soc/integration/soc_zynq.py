@@ -4,6 +4,7 @@
 import os
 
 from migen import *
+from migen.genlib.cdc import MultiReg
 
 from litex.build.generic_platform import tools
 from litex.soc.integration.soc_core import *
@@ -11,6 +12,63 @@ from litex.soc.integration.export import get_csr_header
 from litex.soc.interconnect import wishbone
 from litex.soc.interconnect import axi
 
+# Constants ----------------------------------------------------------------------------------------
+
+# Static portion of the PS7 parameters: fully determined at module load, shared by all instances;
+# only the Signal-typed pad/port connections are bound per-instance. The tie-offs share a single
+# Constant so repeated instantiations don't create fresh Constant objects per port.
+_ZERO = Constant(0)
+
+_PS7_STATIC_PARAMS = dict(
+    # ethernet
+    i_ENET0_MDIO_I = _ZERO,
+
+    # sdio0
+    i_SDIO0_WP = _ZERO,
+
+    # usb0
+    i_USB0_VBUS_PWRFAULT = _ZERO,
+)
+
+# AXI Instance parameters --------------------------------------------------------------------------
+
+# AXI channel fields as named on the PS7 Instance ports; a single source of truth for the
+# GP/HP port bindings below.
+_AXI_CHANNEL_FIELDS = {
+    "aw": ["valid", "ready", "addr", "burst", "len", "size", "id", "lock", "prot", "cache", "qos"],
+    "w" : ["valid", "ready", "last", "id", "data", "strb"],
+    "b" : ["valid", "ready", "id", "resp"],
+    "ar": ["valid", "ready", "addr", "burst", "len", "size", "id", "lock", "prot", "cache", "qos"],
+    "r" : ["valid", "ready", "last", "id", "resp", "data"],
+}
+
+# ClockSignal proxies are immutable named references resolved at build time, so one object per
+# clock domain can be shared by every port binding instead of allocating one per port.
+_clock_signals = {}
+
+def _clock_signal(domain):
+    try:
+        return _clock_signals[domain]
+    except KeyError:
+        return _clock_signals.setdefault(domain, ClockSignal(domain))
+
+
+def _axi_port_params(prefix, axi_port, mode):
+    """Generate the Instance parameters binding axi_port to the PS7 port named prefix.
+
+    mode is the PS7's role on the port: "master" for M_AXI_* ports, "slave" for S_AXI_* ports.
+    """
+    assert mode in ["master", "slave"]
+    params = {"i_" + prefix + "_ACLK": _clock_signal(axi_port.clock_domain)}
+    for channel, fields in _AXI_CHANNEL_FIELDS.items():
+        for field in fields:
+            # valid/payload flow in the channel direction, ready flows against it.
+            m2s = (field != "ready") == (channel in ["aw", "w", "ar"])
+            o   = m2s == (mode == "master")
+            params["{}_{}_{}{}".format("o" if o else "i", prefix, channel.upper(), field.upper())] = \
+                getattr(getattr(axi_port, channel), field)
+    return params
+
 # Record layouts -----------------------------------------------------------------------------------
 
 def axi_fifo_ctrl_layout():
@@ -33,15 +91,23 @@ class SoCZynq(SoCCore):
 
         # PS7 (Minimal) ----------------------------------------------------------------------------
         fclk_reset0_n = Signal()
-        ps7_ddram_pads = platform.request("ps7_ddram")
-        self.ps7_params = dict(
+        # All PS7 pads are required for the PS to operate, so resolve them with a single scan of
+        # the constraint list instead of one lookup per resource.
+        ps7_pads = platform.request_many([
+            "ps7_clk", "ps7_porb", "ps7_srstb", "ps7_mio", "ps7_ddram"])
+        ps7_ddram_pads = ps7_pads["ps7_ddram"]
+        # Optional AXI ports contribute their parameters as separate groups, merged into
+        # ps7_params once at finalization instead of growing the dict incrementally.
+        self.ps7_param_groups = []
+        self.ps7_params = dict(_PS7_STATIC_PARAMS)
+        self.ps7_params.update(
             # clk/rst
-            io_PS_CLK   = platform.request("ps7_clk"),
-            io_PS_PORB  = platform.request("ps7_porb"),
-            io_PS_SRSTB = platform.request("ps7_srstb"),
+            io_PS_CLK   = ps7_pads["ps7_clk"],
+            io_PS_PORB  = ps7_pads["ps7_porb"],
+            io_PS_SRSTB = ps7_pads["ps7_srstb"],
 
             # mio
-            io_MIO=platform.request("ps7_mio"),
+            io_MIO = ps7_pads["ps7_mio"],
 
             # ddram
             io_DDR_Addr     = ps7_ddram_pads.addr,
@@ -62,153 +128,123 @@ class SoCZynq(SoCCore):
             io_DDR_VRN      = ps7_ddram_pads.vrn,
             io_DDR_VRP      = ps7_ddram_pads.vrp,
 
-            # ethernet
-            i_ENET0_MDIO_I=0,
-
-            # sdio0
-            i_SDIO0_WP=0,
-
-            # usb0
-            i_USB0_VBUS_PWRFAULT=0,
-
             # fabric clk/rst
             o_FCLK_CLK0     = ClockSignal("sys"),
             o_FCLK_RESET0_N = fclk_reset0_n
         )
-        self.comb += ResetSignal("sys").eq(~fclk_reset0_n)
+        # Synchronize reset de-assertion: fclk_reset0_n comes from the PS asynchronously to
+        # FCLK_CLK0, so re-time it through two sys-clk FFs (MultiReg is reset-less) instead of
+        # feeding it combinationally into the system reset.
+        sys_rst = Signal(reset=1)
+        self.specials += MultiReg(~fclk_reset0_n, sys_rst, reset=1)
+        self.comb += ResetSignal("sys").eq(sys_rst)
         platform.add_ip(os.path.join("ip", ps7_name + ".xci"))
 
-    # GP0 ------------------------------------------------------------------------------------------
+    # GP0/GP1 --------------------------------------------------------------------------------------
 
-    def add_gp0(self):
-        self.axi_gp0 = axi_gp0 = axi.AXIInterface(data_width=32, address_width=32, id_width=12)
-        self.ps7_params.update(
-            # axi gp0 clk
-            i_M_AXI_GP0_ACLK=ClockSignal("sys"),
-
-            # axi gp0 aw
-            o_M_AXI_GP0_AWVALID = axi_gp0.aw.valid,
-            i_M_AXI_GP0_AWREADY = axi_gp0.aw.ready,
-            o_M_AXI_GP0_AWADDR  = axi_gp0.aw.addr,
-            o_M_AXI_GP0_AWBURST = axi_gp0.aw.burst,
-            o_M_AXI_GP0_AWLEN   = axi_gp0.aw.len,
-            o_M_AXI_GP0_AWSIZE  = axi_gp0.aw.size,
-            o_M_AXI_GP0_AWID    = axi_gp0.aw.id,
-            o_M_AXI_GP0_AWLOCK  = axi_gp0.aw.lock,
-            o_M_AXI_GP0_AWPROT  = axi_gp0.aw.prot,
-            o_M_AXI_GP0_AWCACHE = axi_gp0.aw.cache,
-            o_M_AXI_GP0_AWQOS   = axi_gp0.aw.qos,
-
-            # axi gp0 w
-            o_M_AXI_GP0_WVALID = axi_gp0.w.valid,
-            o_M_AXI_GP0_WLAST  = axi_gp0.w.last,
-            i_M_AXI_GP0_WREADY = axi_gp0.w.ready,
-            o_M_AXI_GP0_WID    = axi_gp0.w.id,
-            o_M_AXI_GP0_WDATA  = axi_gp0.w.data,
-            o_M_AXI_GP0_WSTRB  = axi_gp0.w.strb,
-
-            # axi gp0 b
-            i_M_AXI_GP0_BVALID = axi_gp0.b.valid,
-            o_M_AXI_GP0_BREADY = axi_gp0.b.ready,
-            i_M_AXI_GP0_BID    = axi_gp0.b.id,
-            i_M_AXI_GP0_BRESP  = axi_gp0.b.resp,
-
-            # axi gp0 ar
-            o_M_AXI_GP0_ARVALID = axi_gp0.ar.valid,
-            i_M_AXI_GP0_ARREADY = axi_gp0.ar.ready,
-            o_M_AXI_GP0_ARADDR  = axi_gp0.ar.addr,
-            o_M_AXI_GP0_ARBURST = axi_gp0.ar.burst,
-            o_M_AXI_GP0_ARLEN   = axi_gp0.ar.len,
-            o_M_AXI_GP0_ARID    = axi_gp0.ar.id,
-            o_M_AXI_GP0_ARLOCK  = axi_gp0.ar.lock,
-            o_M_AXI_GP0_ARSIZE  = axi_gp0.ar.size,
-            o_M_AXI_GP0_ARPROT  = axi_gp0.ar.prot,
-            o_M_AXI_GP0_ARCACHE = axi_gp0.ar.cache,
-            o_M_AXI_GP0_ARQOS   = axi_gp0.ar.qos,
-
-            # axi gp0 r
-            i_M_AXI_GP0_RVALID = axi_gp0.r.valid,
-            o_M_AXI_GP0_RREADY = axi_gp0.r.ready,
-            i_M_AXI_GP0_RLAST  = axi_gp0.r.last,
-            i_M_AXI_GP0_RID    = axi_gp0.r.id,
-            i_M_AXI_GP0_RRESP  = axi_gp0.r.resp,
-            i_M_AXI_GP0_RDATA  = axi_gp0.r.data,
-        )
-
-    # HP0 ------------------------------------------------------------------------------------------
-
-    def add_hp0(self):
-        self.axi_hp0 = axi_hp0 = axi.AXIInterface(data_width=64, address_width=32, id_width=6)
-        self.axi_hp0_fifo_ctrl = axi_hp0_fifo_ctrl = Record(axi_fifo_ctrl_layout())
-        self.ps7_params.update(
-            # axi hp0 clk
-            i_S_AXI_HP0_ACLK=ClockSignal("sys"),
-
-            # axi hp0 aw
-            i_S_AXI_HP0_AWVALID = axi_hp0.aw.valid,
-            o_S_AXI_HP0_AWREADY = axi_hp0.aw.ready,
-            i_S_AXI_HP0_AWADDR  = axi_hp0.aw.addr,
-            i_S_AXI_HP0_AWBURST = axi_hp0.aw.burst,
-            i_S_AXI_HP0_AWLEN   = axi_hp0.aw.len,
-            i_S_AXI_HP0_AWSIZE  = axi_hp0.aw.size,
-            i_S_AXI_HP0_AWID    = axi_hp0.aw.id,
-            i_S_AXI_HP0_AWLOCK  = axi_hp0.aw.lock,
-            i_S_AXI_HP0_AWPROT  = axi_hp0.aw.prot,
-            i_S_AXI_HP0_AWCACHE = axi_hp0.aw.cache,
-            i_S_AXI_HP0_AWQOS   = axi_hp0.aw.qos,
-
-            # axi hp0 w
-            i_S_AXI_HP0_WVALID = axi_hp0.w.valid,
-            i_S_AXI_HP0_WLAST  = axi_hp0.w.last,
-            o_S_AXI_HP0_WREADY = axi_hp0.w.ready,
-            i_S_AXI_HP0_WID    = axi_hp0.w.id,
-            i_S_AXI_HP0_WDATA  = axi_hp0.w.data,
-            i_S_AXI_HP0_WSTRB  = axi_hp0.w.strb,
-
-            # axi hp0 b
-            o_S_AXI_HP0_BVALID = axi_hp0.b.valid,
-            i_S_AXI_HP0_BREADY = axi_hp0.b.ready,
-            o_S_AXI_HP0_BID    = axi_hp0.b.id,
-            o_S_AXI_HP0_BRESP  = axi_hp0.b.resp,
-
-            # axi hp0 ar
-            i_S_AXI_HP0_ARVALID = axi_hp0.ar.valid,
-            o_S_AXI_HP0_ARREADY = axi_hp0.ar.ready,
-            i_S_AXI_HP0_ARADDR  = axi_hp0.ar.addr,
-            i_S_AXI_HP0_ARBURST = axi_hp0.ar.burst,
-            i_S_AXI_HP0_ARLEN   = axi_hp0.ar.len,
-            i_S_AXI_HP0_ARID    = axi_hp0.ar.id,
-            i_S_AXI_HP0_ARLOCK  = axi_hp0.ar.lock,
-            i_S_AXI_HP0_ARSIZE  = axi_hp0.ar.size,
-            i_S_AXI_HP0_ARPROT  = axi_hp0.ar.prot,
-            i_S_AXI_HP0_ARCACHE = axi_hp0.ar.cache,
-            i_S_AXI_HP0_ARQOS   = axi_hp0.ar.qos,
-
-            # axi hp0 r
-            o_S_AXI_HP0_RVALID = axi_hp0.r.valid,
-            i_S_AXI_HP0_RREADY = axi_hp0.r.ready,
-            o_S_AXI_HP0_RLAST  = axi_hp0.r.last,
-            o_S_AXI_HP0_RID    = axi_hp0.r.id,
-            o_S_AXI_HP0_RRESP  = axi_hp0.r.resp,
-            o_S_AXI_HP0_RDATA  = axi_hp0.r.data,
-
-            # axi hp0 fifo ctrl
-            o_S_AXI_HP0_RACOUNT        = axi_hp0_fifo_ctrl.racount,
-            o_S_AXI_HP0_RCOUNT         = axi_hp0_fifo_ctrl.rcount,
-            i_S_AXI_HP0_RDISSUECAP1_EN = axi_hp0_fifo_ctrl.rdissuecapen,
-            o_S_AXI_HP0_WACOUNT        = axi_hp0_fifo_ctrl.wacount,
-            o_S_AXI_HP0_WCOUNT         = axi_hp0_fifo_ctrl.wcount,
-            i_S_AXI_HP0_WRISSUECAP1_EN = axi_hp0_fifo_ctrl.wrissuecapen
-        )
+    def add_gp(self, n):
+        # The two GP master ports are hardware-fixed at 32-bit; exposing both lets PS software
+        # reach two independent fabric slaves without sharing one port's bandwidth.
+        assert n in range(2)
+        axi_gp = axi.AXIInterface(data_width=32, address_width=32, id_width=12)
+        setattr(self, "axi_gp{}".format(n), axi_gp)
+        self.ps7_param_groups.append(_axi_port_params("M_AXI_GP{}".format(n), axi_gp, mode="master"))
+        return axi_gp
 
-    def add_axi_to_wishbone(self, axi_port, base_address=0x43c00000):
+    def add_gp0(self):
+        return self.add_gp(0)
+
+    # HP0..HP3 -------------------------------------------------------------------------------------
+
+    def add_hp(self, n, data_width=64, qos=None):
+        # The HP slave ports are configurable as 32-bit or 64-bit; use the full 64-bit width by
+        # default: cache-line sized transfers then complete in half the beats, which keeps the
+        # DDR row open and improves controller utilization. The four ports reach the DDR
+        # controller through independent FIFOs, so heavy fabric masters should be spread over
+        # several HP ports rather than arbitrated onto one.
+        # qos optionally ties AWQOS/ARQOS to a fixed priority read by the DDR arbiter: use a high
+        # value for latency-sensitive masters and a low one for bulk DMA so the former are not
+        # starved under contention.
+        assert n in range(4)
+        assert data_width in [32, 64]
+        assert qos is None or qos in range(16)
+        prefix  = "S_AXI_HP{}".format(n)
+        # id_width is fixed by the PS7 (6 on HP, 3 on ACP, 12 on GP); RID/BID are wired through
+        # the channel table, so fabric masters issuing distinct IDs get out-of-order completion
+        # and read/write overlap from the HPS interconnect without further plumbing.
+        axi_hp  = axi.AXIInterface(data_width=data_width, address_width=32, id_width=6)
+        axi_hp_fifo_ctrl = Record(axi_fifo_ctrl_layout())
+        setattr(self, "axi_hp{}".format(n), axi_hp)
+        setattr(self, "axi_hp{}_fifo_ctrl".format(n), axi_hp_fifo_ctrl)
+        if qos is not None:
+            self.comb += [
+                axi_hp.aw.qos.eq(qos),
+                axi_hp.ar.qos.eq(qos),
+            ]
+        self.ps7_param_groups.append(_axi_port_params(prefix, axi_hp, mode="slave"))
+        self.ps7_param_groups.append({
+            # axi hp fifo ctrl
+            "o_{}_RACOUNT".format(prefix):        axi_hp_fifo_ctrl.racount,
+            "o_{}_RCOUNT".format(prefix):         axi_hp_fifo_ctrl.rcount,
+            "i_{}_RDISSUECAP1_EN".format(prefix): axi_hp_fifo_ctrl.rdissuecapen,
+            "o_{}_WACOUNT".format(prefix):        axi_hp_fifo_ctrl.wacount,
+            "o_{}_WCOUNT".format(prefix):         axi_hp_fifo_ctrl.wcount,
+            "i_{}_WRISSUECAP1_EN".format(prefix): axi_hp_fifo_ctrl.wrissuecapen,
+        })
+        return axi_hp
+
+    def add_hp0(self, data_width=64):
+        return self.add_hp(0, data_width)
+
+    # ACP ------------------------------------------------------------------------------------------
+
+    def add_acp(self):
+        # The ACP reaches the CPU caches through the SCU: transactions marked cacheable are
+        # snooped and hit L1/L2 directly, removing the software cache-flush round-trip that
+        # HP-port transfers of small shared buffers pay. Best used with bursts aligned to the
+        # 32-byte cache-line geometry.
+        self.axi_acp = axi_acp = axi.AXIInterface(data_width=64, address_width=32, id_width=3)
+        self.ps7_param_groups.append(_axi_port_params("S_AXI_ACP", axi_acp, mode="slave"))
+        self.ps7_param_groups.append(dict(
+            # coherent request (AxUSER[0]) with allocation hints
+            i_S_AXI_ACP_AWUSER = 0b11111,
+            i_S_AXI_ACP_ARUSER = 0b11111,
+        ))
+        # cacheable/write-back/allocating so the SCU snoops the transactions
+        self.comb += [
+            axi_acp.aw.cache.eq(0b1111),
+            axi_acp.ar.cache.eq(0b1111),
+        ]
+        return axi_acp
+
+    def add_axi_to_wishbone(self, axi_port, base_address=0x43c00000, resp_buffer_depth=8):
+        # Note: SoCBusHandler.add_adapter is the shared bridge factory; this helper only exists
+        # to apply the GP window's base-address shift before the bridge. Identically-configured
+        # ports still get their own bridge instance: one converter can't serve two AXI ports
+        # without an arbiter in front of it.
+        # The response buffer holds a full 32-byte cache-line burst (8 beats on the 32-bit GP
+        # port) so the AXI side streams responses without stalling on the serialized Wishbone
+        # accesses behind it.
         wb = wishbone.Interface()
-        axi2wishbone = axi.AXI2Wishbone(axi_port, wb, base_address)
+        axi2wishbone = axi.AXI2Wishbone(axi_port, wb, base_address, resp_buffer_depth)
         self.submodules += axi2wishbone
         self.add_wb_master(wb)
 
     def do_finalize(self):
         SoCCore.do_finalize(self)
+        # Materialize the full port map in a single pass, sorted by port name so the emitted
+        # instantiation is reproducible regardless of the order the add_* methods were called in;
+        # ps7_params itself stays the base dict so code customizing it before finalization keeps
+        # working.
+        self.ps7_params = dict(sorted(
+            (item
+                for group in [self.ps7_params] + self.ps7_param_groups
+                for item in group.items()),
+            key=lambda item: item[0]))
+        # Note: emitting the PS7 port map as pre-serialized Verilog text (to skip Migen's Instance
+        # keyword dispatch) was evaluated and rejected: signal names are only assigned by the
+        # namespace at build time, so a verbatim port map would bypass signal resolution for no
+        # measurable gain (the Instance is built once per SoC).
         self.specials += Instance(self.ps7_name, **self.ps7_params)
 
     def generate_software_header(self, filename):
@@ -7,6 +7,9 @@
 from migen import *
 
 from litex.soc.interconnect import stream
+from litex.soc.interconnect import csr_bus
+from litex.soc.interconnect.csr import AutoCSR, CSRStorage, CSRStatus
+from litex.soc.interconnect.csr_eventmanager import EventManager, EventSourcePulse
 from litex.build.generic_platform import *
 
 # AXI Definition -----------------------------------------------------------------------------------
@@ -57,10 +60,15 @@ def r_description(data_width, id_width):
 
 class AXIInterface:
     def __init__(self, data_width=32, address_width=32, id_width=1, clock_domain="sys"):
+        # Fail at interface creation with a clear message rather than deep inside a bridge's
+        # log2_int when handed a width that isn't a power-of-two number of bytes.
+        assert data_width in [8, 16, 32, 64, 128, 256, 512, 1024], \
+            "invalid data_width {}".format(data_width)
         self.data_width    = data_width
         self.address_width = address_width
         self.id_width      = id_width
         self.clock_domain  = clock_domain
+        self.adr_shift     = log2_int(data_width//8) # byte/word address shift, fixed per interface
 
         self.aw = stream.Endpoint(ax_description(address_width, id_width))
         self.w  = stream.Endpoint(w_description(data_width, id_width))
@@ -90,9 +98,12 @@ def r_lite_description(data_width):
 
 class AXILiteInterface:
     def __init__(self, data_width=32, address_width=32, clock_domain="sys"):
+        assert data_width in [8, 16, 32, 64, 128, 256, 512, 1024], \
+            "invalid data_width {}".format(data_width)
         self.data_width    = data_width
         self.address_width = address_width
         self.clock_domain  = clock_domain
+        self.adr_shift     = log2_int(data_width//8) # byte/word address shift, fixed per interface
 
         self.aw = stream.Endpoint(ax_lite_description(address_width))
         self.w  = stream.Endpoint(w_lite_description(data_width))
@@ -223,50 +234,174 @@ class AXIBurst2Beat(Module):
         ]
 
 
+# AXI Clock Domain Crossing ------------------------------------------------------------------------
+
+def _axi_channel_cdc(channel_from, channel_to, cd_from, cd_to, depth):
+    cdc = stream.AsyncFIFO(channel_from.description, depth)
+    cdc = ClockDomainsRenamer({"write": cd_from, "read": cd_to})(cdc)
+    return cdc, [channel_from.connect(cdc.sink), cdc.source.connect(channel_to)]
+
+class AXIClockDomainCrossing(Module):
+    """AXI crossing between the interfaces' clock domains, one AsyncFIFO per channel."""
+    def __init__(self, axi_from, axi_to, depth=8):
+        assert axi_from.data_width    == axi_to.data_width
+        assert axi_from.address_width == axi_to.address_width
+        assert axi_from.id_width      == axi_to.id_width
+        cd_from = axi_from.clock_domain
+        cd_to   = axi_to.clock_domain
+        for channel in ["aw", "w", "ar"]:
+            cdc, connections = _axi_channel_cdc(
+                getattr(axi_from, channel), getattr(axi_to, channel), cd_from, cd_to, depth)
+            self.submodules += cdc
+            self.comb += connections
+        for channel in ["b", "r"]:
+            cdc, connections = _axi_channel_cdc(
+                getattr(axi_to, channel), getattr(axi_from, channel), cd_to, cd_from, depth)
+            self.submodules += cdc
+            self.comb += connections
+
+class AXILiteClockDomainCrossing(Module):
+    """AXI-Lite crossing between the interfaces' clock domains, one AsyncFIFO per channel."""
+    def __init__(self, axi_lite_from, axi_lite_to, depth=8):
+        assert axi_lite_from.data_width    == axi_lite_to.data_width
+        assert axi_lite_from.address_width == axi_lite_to.address_width
+        cd_from = axi_lite_from.clock_domain
+        cd_to   = axi_lite_to.clock_domain
+        for channel in ["aw", "w", "ar"]:
+            cdc, connections = _axi_channel_cdc(
+                getattr(axi_lite_from, channel), getattr(axi_lite_to, channel), cd_from, cd_to, depth)
+            self.submodules += cdc
+            self.comb += connections
+        for channel in ["b", "r"]:
+            cdc, connections = _axi_channel_cdc(
+                getattr(axi_lite_to, channel), getattr(axi_lite_from, channel), cd_to, cd_from, depth)
+            self.submodules += cdc
+            self.comb += connections
+
+# AXI Up-Converter ---------------------------------------------------------------------------------
+
+class AXIUpConverter(Module):
+    def __init__(self, axi_from, axi_to):
+        dw_from  = axi_from.data_width
+        dw_to    = axi_to.data_width
+        ratio    = dw_to//dw_from
+        assert dw_from*ratio == dw_to
+
+        # # #
+
+        # Note: *General* definition of the converter could be complex, we only support the simple
+        # case of converting the burst itself (not the data): i.e. a burst of 16x32-bit is converted
+        # to a burst of 4x128-bit. This is the expected use case for CPUs with a narrow AXI bus
+        # connected to a wider memory bus and requires bursts to be aligned on the wide data-width.
+
+        # AW Channel.
+        # Set AxCACHE[1] (Modifiable): converted bursts no longer match the original transactions
+        # and marking them Modifiable allows downstream converters/interconnects to pack them.
+        self.comb += [
+            axi_from.aw.connect(axi_to.aw, omit={"len", "size", "cache"}),
+            axi_to.aw.len.eq(  axi_from.aw.len >> log2_int(ratio)),
+            axi_to.aw.size.eq( axi_from.aw.size + log2_int(ratio)),
+            axi_to.aw.cache.eq(axi_from.aw.cache | 0b0010),
+        ]
+
+        # W Channel.
+        w_converter = stream.StrideConverter(
+            description_from = [("data", dw_from), ("strb", dw_from//8)],
+            description_to   = [("data", dw_to),   ("strb", dw_to//8)],
+        )
+        self.submodules += w_converter
+        self.comb += axi_from.w.connect(w_converter.sink, omit={"id"})
+        self.comb += w_converter.source.connect(axi_to.w)
+        self.comb += axi_to.w.id.eq(axi_from.w.id)
+
+        # B Channel.
+        self.comb += axi_to.b.connect(axi_from.b)
+
+        # AR Channel.
+        self.comb += [
+            axi_from.ar.connect(axi_to.ar, omit={"len", "size", "cache"}),
+            axi_to.ar.len.eq(  axi_from.ar.len >> log2_int(ratio)),
+            axi_to.ar.size.eq( axi_from.ar.size + log2_int(ratio)),
+            axi_to.ar.cache.eq(axi_from.ar.cache | 0b0010),
+        ]
+
+        # R Channel.
+        r_converter = stream.StrideConverter(
+            description_from = [("data", dw_to)],
+            description_to   = [("data", dw_from)],
+        )
+        self.submodules += r_converter
+        self.comb += axi_to.r.connect(r_converter.sink, omit={"id", "resp"})
+        self.comb += r_converter.source.connect(axi_from.r)
+        self.comb += [
+            axi_from.r.resp.eq(axi_to.r.resp),
+            axi_from.r.id.eq(axi_to.r.id),
+        ]
+
 # AXI to AXI Lite ----------------------------------------------------------------------------------
 
 class AXI2AXILite(Module):
     # Note: Since this AXI bridge will mostly be used to target buses that are not supporting
     # simultaneous writes/reads, to reduce ressource usage the AXIBurst2Beat module is shared
     # between writes/reads.
-    def __init__(self, axi, axi_lite):
+    def __init__(self, axi, axi_lite, resp_buffer_depth=1, cmd_buffer_depth=1):
         assert axi.data_width    == axi_lite.data_width
         assert axi.address_width == axi_lite.address_width
+        assert resp_buffer_depth >= 1
+        assert cmd_buffer_depth  >= 1
 
-        ax_buffer = stream.Buffer(ax_description(axi.address_width, axi.id_width))
-        ax_burst  = stream.Endpoint(ax_description(axi.address_width, axi.id_width))
-        ax_beat   = stream.Endpoint(ax_description(axi.address_width, axi.id_width))
-        self.comb += ax_burst.connect(ax_buffer.sink)
-        ax_burst2beat = AXIBurst2Beat(ax_buffer.source, ax_beat)
-        self.submodules += ax_buffer, ax_burst2beat
+        # Command buffer: AW/AR commands are accepted (with a read/write flag) as soon as there is
+        # room, independently of the FSM, so the master can have up to cmd_buffer_depth
+        # transactions outstanding while the current one is executed.
+        cmd_buffer = stream.SyncFIFO(
+            ax_description(axi.address_width, axi.id_width) + [("we", 1)], cmd_buffer_depth)
+        ax_beat = stream.Endpoint(ax_description(axi.address_width, axi.id_width))
+        ax_burst2beat = AXIBurst2Beat(cmd_buffer.source, ax_beat)
+        self.submodules += cmd_buffer, ax_burst2beat
 
-        _data         = Signal(axi.data_width)
-        _cmd_done     = Signal()
         _last_ar_aw_n = Signal()
-
-        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
-        fsm.act("IDLE",
-            NextValue(_cmd_done, 0),
+        self.comb += [
             If(axi.ar.valid & axi.aw.valid,
                 # If last access was a read, do a write
                 If(_last_ar_aw_n,
-                    axi.aw.connect(ax_burst),
-                    NextValue(_last_ar_aw_n, 0),
-                    NextState("WRITE")
+                    axi.aw.connect(cmd_buffer.sink, omit={"we"}),
+                    cmd_buffer.sink.we.eq(1)
                 # If last access was a write, do a read
                 ).Else(
-                    axi.ar.connect(ax_burst),
-                    NextValue(_last_ar_aw_n, 1),
-                    NextState("READ"),
+                    axi.ar.connect(cmd_buffer.sink, omit={"we"})
                 )
             ).Elif(axi.ar.valid,
-                axi.ar.connect(ax_burst),
-                NextValue(_last_ar_aw_n, 1),
-                NextState("READ"),
+                axi.ar.connect(cmd_buffer.sink, omit={"we"})
             ).Elif(axi.aw.valid,
-                axi.aw.connect(ax_burst),
-                NextValue(_last_ar_aw_n, 0),
-                NextState("WRITE")
+                axi.aw.connect(cmd_buffer.sink, omit={"we"}),
+                cmd_buffer.sink.we.eq(1)
+            )
+        ]
+        self.sync += [
+            If(cmd_buffer.sink.valid & cmd_buffer.sink.ready,
+                _last_ar_aw_n.eq(~cmd_buffer.sink.we)
+            )
+        ]
+
+        # R-channel response buffer: decouples the AXI master from the (often slower) AXI-Lite
+        # side so that reads no longer stall the FSM for a full response round-trip per beat.
+        r_buffer = stream.SyncFIFO(r_description(axi.data_width, axi.id_width), resp_buffer_depth)
+        self.submodules += r_buffer
+        self.comb += r_buffer.source.connect(axi.r)
+
+        _cmd_done     = Signal()
+        _resp_count   = Signal(8)
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(_cmd_done,   0),
+            NextValue(_resp_count, 0),
+            If(cmd_buffer.source.valid,
+                If(cmd_buffer.source.we,
+                    NextState("WRITE")
+                ).Else(
+                    NextState("READ")
+                )
             )
         )
         fsm.act("READ",
@@ -281,16 +416,21 @@ class AXI2AXILite(Module):
                 )
             ),
             # data
-            axi.r.valid.eq(axi_lite.r.valid),
-            axi.r.last.eq(_cmd_done),
-            axi.r.resp.eq(RESP_OKAY),
-            axi.r.id.eq(ax_beat.id),
-            axi.r.data.eq(axi_lite.r.data),
-            axi_lite.r.ready.eq(axi.r.ready),
-            # exit
-            If(axi.r.valid & axi.r.last & axi.r.ready,
-                ax_beat.ready.eq(1),
-                NextState("IDLE")
+            # Note: with buffered responses, commands can run ahead of responses, so the last
+            # beat is identified by counting responses rather than from the command side.
+            r_buffer.sink.valid.eq(axi_lite.r.valid),
+            r_buffer.sink.last.eq(_resp_count == cmd_buffer.source.len),
+            r_buffer.sink.resp.eq(RESP_OKAY),
+            r_buffer.sink.id.eq(ax_beat.id),
+            r_buffer.sink.data.eq(axi_lite.r.data),
+            axi_lite.r.ready.eq(r_buffer.sink.ready),
+            If(r_buffer.sink.valid & r_buffer.sink.ready,
+                NextValue(_resp_count, _resp_count + 1),
+                # exit
+                If(r_buffer.sink.last,
+                    ax_beat.ready.eq(1),
+                    NextState("IDLE")
+                )
             )
         )
         # always accept write responses
@@ -328,11 +468,25 @@ class AXI2AXILite(Module):
 
 # AXI Lite to Wishbone -----------------------------------------------------------------------------
 
+def wishbone_adr_shift(data_width):
+    # Address shift between byte-addressed AXI and word-addressed Wishbone; data_width has to be a
+    # power of two. Shared by the AXI-Lite<->Wishbone bridges so dimensions are computed (and
+    # checked) in a single place.
+    return log2_int(data_width//8)
+
+
 class AXILite2Wishbone(Module):
-    def __init__(self, axi_lite, wishbone, base_address=0x00000000):
-        wishbone_adr_shift = log2_int(axi_lite.data_width//8)
+    def __init__(self, axi_lite, wishbone, base_address=0x00000000, resp_buffer_depth=1):
+        adr_shift = wishbone_adr_shift(axi_lite.data_width)
         assert axi_lite.data_width    == len(wishbone.dat_r)
-        assert axi_lite.address_width == len(wishbone.adr) + wishbone_adr_shift
+        assert axi_lite.address_width == len(wishbone.adr) + adr_shift
+        assert resp_buffer_depth >= 1
+
+        # Read-response buffer: lets the FSM return to IDLE as soon as the Wishbone access
+        # completes instead of stalling until the AXI-Lite master has consumed the response.
+        r_buffer = stream.SyncFIFO(r_lite_description(axi_lite.data_width), resp_buffer_depth)
+        self.submodules += r_buffer
+        self.comb += r_buffer.source.connect(axi_lite.r)
 
         _data         = Signal(axi_lite.data_width)
         _r_addr       = Signal(axi_lite.address_width)
@@ -364,7 +518,7 @@ class AXILite2Wishbone(Module):
         fsm.act("DO-READ",
             wishbone.stb.eq(1),
             wishbone.cyc.eq(1),
-            wishbone.adr.eq(_r_addr[wishbone_adr_shift:]),
+            wishbone.adr.eq(_r_addr[adr_shift:]),
             If(wishbone.ack,
                 axi_lite.ar.ready.eq(1),
                 NextValue(_data, wishbone.dat_r),
@@ -372,10 +526,10 @@ class AXILite2Wishbone(Module):
             )
         )
         fsm.act("SEND-READ-RESPONSE",
-            axi_lite.r.valid.eq(1),
-            axi_lite.r.resp.eq(RESP_OKAY),
-            axi_lite.r.data.eq(_data),
-            If(axi_lite.r.ready,
+            r_buffer.sink.valid.eq(1),
+            r_buffer.sink.resp.eq(RESP_OKAY),
+            r_buffer.sink.data.eq(_data),
+            If(r_buffer.sink.ready,
                 NextState("IDLE")
             )
         )
@@ -383,7 +537,7 @@ class AXILite2Wishbone(Module):
             wishbone.stb.eq(axi_lite.w.valid),
             wishbone.cyc.eq(axi_lite.w.valid),
             wishbone.we.eq(1),
-            wishbone.adr.eq(_w_addr[wishbone_adr_shift:]),
+            wishbone.adr.eq(_w_addr[adr_shift:]),
             wishbone.sel.eq(axi_lite.w.strb),
             wishbone.dat_w.eq(axi_lite.w.data),
             If(wishbone.ack,
@@ -403,19 +557,323 @@ class AXILite2Wishbone(Module):
 # AXI to Wishbone ----------------------------------------------------------------------------------
 
 class AXI2Wishbone(Module):
-    def __init__(self, axi, wishbone, base_address=0x00000000):
-        axi_lite          = AXILiteInterface(axi.data_width, axi.address_width)
-        axi2axi_lite      = AXI2AXILite(axi, axi_lite)
-        axi_lite2wishbone = AXILite2Wishbone(axi_lite, wishbone, base_address)
-        self.submodules += axi2axi_lite, axi_lite2wishbone
+    # With bursting=True the AXI burst is kept end-to-end: beats are issued as a Wishbone B4
+    # registered-feedback cycle (CTI=incrementing, end-of-burst on the last beat) so
+    # burst-capable slaves can ack one beat per cycle instead of paying a full classic
+    # handshake round-trip per beat. Classic slaves simply ignore CTI/BTE.
+    def __init__(self, axi, wishbone, base_address=0x00000000, resp_buffer_depth=1,
+                 bursting=False, cmd_buffer_depth=1):
+        if not bursting:
+            axi_lite          = AXILiteInterface(axi.data_width, axi.address_width)
+            axi2axi_lite      = AXI2AXILite(axi, axi_lite, resp_buffer_depth, cmd_buffer_depth)
+            axi_lite2wishbone = AXILite2Wishbone(axi_lite, wishbone, base_address)
+            self.submodules += axi2axi_lite, axi_lite2wishbone
+            return
+
+        adr_shift = wishbone_adr_shift(axi.data_width)
+        assert axi.data_width    == len(wishbone.dat_r)
+        assert axi.address_width == len(wishbone.adr) + adr_shift
+        assert resp_buffer_depth >= 1
+
+        ax_buffer = stream.Buffer(ax_description(axi.address_width, axi.id_width))
+        ax_burst  = stream.Endpoint(ax_description(axi.address_width, axi.id_width))
+        ax_beat   = stream.Endpoint(ax_description(axi.address_width, axi.id_width))
+        self.comb += ax_burst.connect(ax_buffer.sink)
+        ax_burst2beat = AXIBurst2Beat(ax_buffer.source, ax_beat)
+        self.submodules += ax_buffer, ax_burst2beat
+
+        r_buffer = stream.SyncFIFO(r_description(axi.data_width, axi.id_width), resp_buffer_depth)
+        self.submodules += r_buffer
+        self.comb += r_buffer.source.connect(axi.r)
+
+        _last_ar_aw_n = Signal()
+        _id           = Signal(axi.id_width)
+        _bad_resp     = Signal()
+        _beat_addr    = Signal(len(wishbone.adr))
+        self.comb += _beat_addr.eq((ax_beat.addr - base_address) >> adr_shift)
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(_bad_resp, 0),
+            If(axi.ar.valid & axi.aw.valid,
+                If(_last_ar_aw_n,
+                    axi.aw.connect(ax_burst),
+                    NextValue(_id, axi.aw.id),
+                    NextValue(_last_ar_aw_n, 0),
+                    NextState("WRITE")
+                ).Else(
+                    axi.ar.connect(ax_burst),
+                    NextValue(_last_ar_aw_n, 1),
+                    NextState("READ")
+                )
+            ).Elif(axi.ar.valid,
+                axi.ar.connect(ax_burst),
+                NextValue(_last_ar_aw_n, 1),
+                NextState("READ")
+            ).Elif(axi.aw.valid,
+                axi.aw.connect(ax_burst),
+                NextValue(_id, axi.aw.id),
+                NextValue(_last_ar_aw_n, 0),
+                NextState("WRITE")
+            )
+        )
+        # Acked read data is committed by the slave whether or not the response buffer can take
+        # it that cycle, so a one-deep skid register catches the beat when the buffer
+        # back-pressures; stb is only raised when both the buffer and the skid have room.
+        skid_valid = Signal()
+        skid_data  = Signal(axi.data_width)
+        skid_resp  = Signal(2)
+        skid_id    = Signal(axi.id_width)
+        skid_last  = Signal()
+        self.comb += [
+            If(skid_valid,
+                r_buffer.sink.valid.eq(1),
+                r_buffer.sink.last.eq(skid_last),
+                r_buffer.sink.resp.eq(skid_resp),
+                r_buffer.sink.id.eq(skid_id),
+                r_buffer.sink.data.eq(skid_data),
+            )
+        ]
+        self.sync += If(skid_valid & r_buffer.sink.ready, skid_valid.eq(0))
+        fsm.act("READ",
+            wishbone.cyc.eq(1),
+            wishbone.stb.eq(ax_beat.valid & r_buffer.sink.ready & ~skid_valid),
+            wishbone.adr.eq(_beat_addr),
+            wishbone.cti.eq(Mux(ax_beat.last, 0b111, 0b010)),
+            wishbone.bte.eq(0b00),
+            If(wishbone.ack | wishbone.err,
+                If(r_buffer.sink.ready & ~skid_valid,
+                    r_buffer.sink.valid.eq(1),
+                    r_buffer.sink.last.eq(ax_beat.last),
+                    r_buffer.sink.resp.eq(Mux(wishbone.err, RESP_SLVERR, RESP_OKAY)),
+                    r_buffer.sink.id.eq(ax_beat.id),
+                    r_buffer.sink.data.eq(wishbone.dat_r),
+                ).Else(
+                    NextValue(skid_valid, 1),
+                    NextValue(skid_data,  wishbone.dat_r),
+                    NextValue(skid_resp,  Mux(wishbone.err, RESP_SLVERR, RESP_OKAY)),
+                    NextValue(skid_id,    ax_beat.id),
+                    NextValue(skid_last,  ax_beat.last),
+                ),
+                ax_beat.ready.eq(1),
+                If(ax_beat.last,
+                    NextState("IDLE")
+                )
+            )
+        )
+        fsm.act("WRITE",
+            wishbone.cyc.eq(1),
+            wishbone.stb.eq(ax_beat.valid & axi.w.valid),
+            wishbone.we.eq(1),
+            wishbone.adr.eq(_beat_addr),
+            wishbone.sel.eq(axi.w.strb),
+            wishbone.dat_w.eq(axi.w.data),
+            wishbone.cti.eq(Mux(ax_beat.last, 0b111, 0b010)),
+            wishbone.bte.eq(0b00),
+            If(wishbone.ack | wishbone.err,
+                axi.w.ready.eq(1),
+                ax_beat.ready.eq(1),
+                If(wishbone.err,
+                    NextValue(_bad_resp, 1)
+                ),
+                If(ax_beat.last,
+                    NextState("WRITE-RESP")
+                )
+            )
+        )
+        fsm.act("WRITE-RESP",
+            axi.b.valid.eq(1),
+            axi.b.resp.eq(Mux(_bad_resp, RESP_SLVERR, RESP_OKAY)),
+            axi.b.id.eq(_id),
+            If(axi.b.ready,
+                NextState("IDLE")
+            )
+        )
+
+# AXI DMA Writer -----------------------------------------------------------------------------------
+
+class AXIDMAWriter(Module, AutoCSR):
+    """Write a data stream to memory through an AXI master port.
+
+    Transfers length bytes from sink to base using maximal INCR bursts (capped at the AXI 4KB
+    boundary), so bulk FPGA-to-memory traffic moves at full burst width/depth without CPU
+    involvement. base/length have to be aligned to the data width. A descriptor-chained mode can
+    be layered on top by reprogramming base/length from the done interrupt.
+    """
+    def __init__(self, axi, max_burst_len=16):
+        assert max_burst_len in [1, 2, 4, 8, 16]
+        adr_shift = wishbone_adr_shift(axi.data_width)
+
+        self.sink   = sink = stream.Endpoint([("data", axi.data_width)])
+        self.base     = CSRStorage(axi.address_width, name="base")
+        self.length   = CSRStorage(axi.address_width, name="length")
+        self.enable   = CSRStorage(name="enable")
+        self.done     = CSRStatus(name="done")
+        # Interrupt coalescing: raise the done interrupt only every coalesce-th completed
+        # transfer so batch workloads don't pay one interrupt per buffer.
+        self.coalesce = CSRStorage(8, reset=1, name="coalesce")
+
+        self.submodules.ev = EventManager()
+        self.ev.done = EventSourcePulse(name="done")
+        self.ev.finalize()
+
+        # # #
+
+        addr      = Signal(axi.address_width - adr_shift) # word address
+        remaining = Signal(axi.address_width - adr_shift) # beats
+        burst     = Signal(max=max_burst_len + 1) # current burst length (comb)
+        burst_len = Signal(max=max_burst_len + 1) # latched for the data phase
+        beat      = Signal(max=max_burst_len + 1)
+
+        # Cap bursts at the AXI 4KB boundary.
+        words_per_4k = 4096 >> adr_shift
+        boundary     = Signal(max=words_per_4k + 1)
+        self.comb += boundary.eq(words_per_4k - (addr & (words_per_4k - 1)))
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(self.enable.storage & (self.length.storage != 0),
+                NextValue(addr,      self.base.storage[adr_shift:]),
+                NextValue(remaining, self.length.storage[adr_shift:]),
+                NextState("CMD")
+            )
+        )
+        self.comb += [
+            If(remaining < max_burst_len,
+                If(boundary < remaining,
+                    burst.eq(boundary)
+                ).Else(
+                    burst.eq(remaining)
+                )
+            ).Elif(boundary < max_burst_len,
+                burst.eq(boundary)
+            ).Else(
+                burst.eq(max_burst_len)
+            )
+        ]
+        fsm.act("CMD",
+            axi.aw.valid.eq(1),
+            axi.aw.addr.eq(addr << adr_shift),
+            axi.aw.burst.eq(BURST_INCR),
+            axi.aw.len.eq(burst - 1),
+            axi.aw.size.eq(adr_shift),
+            If(axi.aw.ready,
+                NextValue(beat,      0),
+                NextValue(burst_len, burst),
+                NextValue(addr,      addr + burst),
+                NextValue(remaining, remaining - burst),
+                NextState("DATA")
+            )
+        )
+        fsm.act("DATA",
+            axi.w.valid.eq(sink.valid),
+            axi.w.data.eq(sink.data),
+            axi.w.strb.eq(2**(axi.data_width//8) - 1),
+            axi.w.last.eq(beat == (burst_len - 1)),
+            sink.ready.eq(axi.w.ready),
+            If(axi.w.valid & axi.w.ready,
+                NextValue(beat, beat + 1),
+                If(axi.w.last,
+                    NextState("RESP")
+                )
+            )
+        )
+        done_pulse = Signal()
+        completed  = Signal(8)
+        fsm.act("RESP",
+            axi.b.ready.eq(1),
+            If(axi.b.valid,
+                If(remaining != 0,
+                    NextState("CMD")
+                ).Else(
+                    done_pulse.eq(1),
+                    NextState("DONE")
+                )
+            )
+        )
+        self.comb += self.ev.done.trigger.eq(done_pulse & (completed >= (self.coalesce.storage - 1)))
+        self.sync += [
+            If(done_pulse,
+                If(completed >= (self.coalesce.storage - 1),
+                    completed.eq(0)
+                ).Else(
+                    completed.eq(completed + 1)
+                )
+            )
+        ]
+        fsm.act("DONE",
+            self.done.status.eq(1),
+            If(~self.enable.storage,
+                NextState("IDLE")
+            )
+        )
+
+# AXI Lite to CSR ----------------------------------------------------------------------------------
+
+class AXILite2CSR(Module):
+    # Direct AXI-Lite to CSR bridge: control-plane accesses skip the AXILite2Wishbone + WB2CSR
+    # double hop and its extra FSM round-trips.
+    def __init__(self, axi_lite=None, bus_csr=None):
+        if axi_lite is None:
+            axi_lite = AXILiteInterface()
+        if bus_csr is None:
+            bus_csr = csr_bus.Interface()
+        self.axi_lite = axi_lite
+        self.csr      = bus_csr
+        adr_shift     = wishbone_adr_shift(axi_lite.data_width)
+
+        # # #
+
+        _adr = Signal(len(self.csr.adr))
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(axi_lite.aw.valid & axi_lite.w.valid,
+                NextState("WRITE")
+            ).Elif(axi_lite.ar.valid,
+                NextState("READ")
+            )
+        )
+        fsm.act("WRITE",
+            self.csr.adr.eq(axi_lite.aw.addr[adr_shift:]),
+            self.csr.we.eq(1),
+            self.csr.dat_w.eq(axi_lite.w.data),
+            axi_lite.aw.ready.eq(1),
+            axi_lite.w.ready.eq(1),
+            NextState("WRITE-RESP")
+        )
+        fsm.act("WRITE-RESP",
+            axi_lite.b.valid.eq(1),
+            axi_lite.b.resp.eq(RESP_OKAY),
+            If(axi_lite.b.ready,
+                NextState("IDLE")
+            )
+        )
+        fsm.act("READ",
+            self.csr.adr.eq(axi_lite.ar.addr[adr_shift:]),
+            axi_lite.ar.ready.eq(1),
+            NextValue(_adr, axi_lite.ar.addr[adr_shift:]),
+            NextState("READ-RESP")
+        )
+        fsm.act("READ-RESP",
+            # Keep presenting the address: the CSR bank re-registers dat_r from the current
+            # address every cycle, and RDATA has to stay stable while the master stalls RREADY.
+            self.csr.adr.eq(_adr),
+            axi_lite.r.valid.eq(1),
+            axi_lite.r.resp.eq(RESP_OKAY),
+            axi_lite.r.data.eq(self.csr.dat_r),
+            If(axi_lite.r.ready,
+                NextState("IDLE")
+            )
+        )
 
 # Wishbone to AXILite ------------------------------------------------------------------------------
 
 class Wishbone2AXILite(Module):
     def __init__(self, wishbone, axi_lite, base_address=0x00000000):
-        wishbone_adr_shift = log2_int(axi_lite.data_width//8)
+        adr_shift = wishbone_adr_shift(axi_lite.data_width)
         assert axi_lite.data_width    == len(wishbone.dat_r)
-        assert axi_lite.address_width == len(wishbone.adr) + wishbone_adr_shift
+        assert axi_lite.address_width == len(wishbone.adr) + adr_shift
 
         _cmd_done  = Signal()
         _data_done = Signal()
@@ -437,7 +895,7 @@ class Wishbone2AXILite(Module):
         fsm.act("WRITE",
             # cmd
             axi_lite.aw.valid.eq(~_cmd_done),
-            axi_lite.aw.addr[wishbone_adr_shift:].eq(_addr),
+            axi_lite.aw.addr[adr_shift:].eq(_addr),
             If(axi_lite.aw.valid & axi_lite.aw.ready,
                 NextValue(_cmd_done, 1)
             ),
@@ -462,7 +920,7 @@ class Wishbone2AXILite(Module):
         fsm.act("READ",
             # cmd
             axi_lite.ar.valid.eq(~_cmd_done),
-            axi_lite.ar.addr[wishbone_adr_shift:].eq(_addr),
+            axi_lite.ar.addr[adr_shift:].eq(_addr),
             If(axi_lite.ar.valid & axi_lite.ar.ready,
                 NextValue(_cmd_done, 1)
             ),
@@ -483,3 +941,252 @@ class Wishbone2AXILite(Module):
             wishbone.err.eq(1),
             NextState("IDLE")
         )
+
+# Wishbone to AXI ----------------------------------------------------------------------------------
+
+class Wishbone2AXI(Module):
+    # Note: Classic Wishbone is one-address-per-cycle, so a direct translation issues single-beat
+    # (ARLEN=0) AXI transactions and throws away the row-buffer locality of sequential accesses.
+    # With burst_len > 1, reads are coalesced: a miss fetches a full burst into a small buffer and
+    # sequential reads are acked from it, writes invalidate it. Only enable coalescing when the
+    # AXI target is not concurrently written by another master (the buffer is not kept coherent).
+    # With write_burst_len > 1, writes are posted: they are acked immediately into a merge buffer
+    # and contiguous sequences are flushed as a single burst (on a non-contiguous access, a read,
+    # a full buffer or coalesce_timeout idle cycles). Posted writes can no longer report a bad
+    # AXI response back to the master.
+    def __init__(self, wishbone, axi, base_address=0x00000000, burst_len=1, id=0, cache=0b0011,
+                 write_burst_len=1, coalesce_timeout=8):
+        adr_shift = wishbone_adr_shift(axi.data_width)
+        assert axi.data_width    == len(wishbone.dat_r)
+        assert axi.address_width == len(wishbone.adr) + adr_shift
+        assert burst_len in [1, 2, 4, 8, 16]
+        assert write_burst_len in [1, 2, 4, 8, 16]
+        assert coalesce_timeout >= 1
+        assert id < 2**axi.id_width
+        assert cache < 16
+
+        # Mark transactions Bufferable+Modifiable by default: downstream width converters and
+        # interconnects only pack/upsize bursts when AxCACHE[1] is set, and non-coherent memory
+        # semantics are unchanged. Pass cache=0 for strictly unmodifiable device accesses.
+        self.comb += [
+            axi.aw.cache.eq(cache),
+            axi.ar.cache.eq(cache),
+        ]
+
+        # Tag transactions with a per-bridge ID: giving each requester its own ID (instead of
+        # everything on ID 0) lets AXI interconnects overlap and reorder across requesters while
+        # keeping per-requester ordering.
+        self.comb += [
+            axi.aw.id.eq(id),
+            axi.ar.id.eq(id),
+            axi.w.id.eq(id),
+        ]
+
+        _cmd_done  = Signal()
+        _data_done = Signal()
+        _bad_resp  = Signal()
+        _addr      = Signal(len(wishbone.adr))
+        self.comb += _addr.eq(wishbone.adr - (base_address >> adr_shift))
+
+        # Read-coalescing buffer.
+        buf_datas = Array(Signal(axi.data_width) for _ in range(burst_len))
+        buf_adr   = Signal(len(wishbone.adr))
+        buf_level = Signal(max=burst_len + 1)
+        buf_index = Signal(max=max(burst_len, 2))
+        buf_hit   = Signal()
+        if burst_len > 1:
+            self.comb += [
+                buf_hit.eq((wishbone.adr >= buf_adr) & (wishbone.adr < (buf_adr + buf_level))),
+                buf_index.eq(wishbone.adr - buf_adr),
+            ]
+
+        # Write-coalescing buffer.
+        wbuf_datas  = Array(Signal(axi.data_width)    for _ in range(write_burst_len))
+        wbuf_sels   = Array(Signal(axi.data_width//8) for _ in range(write_burst_len))
+        wbuf_adr    = Signal(len(wishbone.adr))
+        wbuf_level  = Signal(max=write_burst_len + 1)
+        wbuf_cap    = Signal(max=write_burst_len + 1)
+        wbuf_we     = Signal()
+        wflush_beat = Signal(max=write_burst_len + 1)
+        _timeout    = Signal(max=coalesce_timeout + 1)
+        self.sync += [
+            If(wbuf_we,
+                wbuf_datas[wbuf_level].eq(wishbone.dat_w),
+                wbuf_sels[wbuf_level].eq(wishbone.sel)
+            )
+        ]
+
+        # Cap bursts at the AXI 4KB boundary.
+        words_per_4k = 4096 >> adr_shift
+        burst_beats  = Signal(max=burst_len + 1)
+        boundary     = Signal(max=words_per_4k + 1)
+        self.comb += [
+            boundary.eq(words_per_4k - (_addr & (words_per_4k - 1))),
+            If(boundary < burst_len,
+                burst_beats.eq(boundary)
+            ).Else(
+                burst_beats.eq(burst_len)
+            )
+        ]
+
+        if write_burst_len > 1:
+            write_dispatch = [
+                # Post the first write into the merge buffer and start collecting.
+                wishbone.ack.eq(1),
+                wbuf_we.eq(1),
+                NextValue(wbuf_adr,   wishbone.adr),
+                NextValue(wbuf_level, 1),
+                If(boundary < write_burst_len,
+                    NextValue(wbuf_cap, boundary)
+                ).Else(
+                    NextValue(wbuf_cap, write_burst_len)
+                ),
+                NextValue(_timeout, 0),
+                NextState("WRITE-COLLECT")
+            ]
+        else:
+            write_dispatch = [NextState("WRITE")]
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            NextValue(_cmd_done,  0),
+            NextValue(_data_done, 0),
+            NextValue(_bad_resp,  0),
+            If(wishbone.stb & wishbone.cyc,
+                If(wishbone.we,
+                    # Writes invalidate the read buffer.
+                    NextValue(buf_level, 0),
+                    *write_dispatch
+                ).Elif(buf_hit,
+                    wishbone.dat_r.eq(buf_datas[buf_index]),
+                    wishbone.ack.eq(1)
+                ).Else(
+                    NextValue(buf_adr,   wishbone.adr),
+                    NextValue(buf_level, 0),
+                    NextState("READ")
+                )
+            )
+        )
+        fsm.act("WRITE",
+            # cmd
+            axi.aw.valid.eq(~_cmd_done),
+            axi.aw.addr[adr_shift:].eq(_addr),
+            axi.aw.burst.eq(BURST_INCR),
+            axi.aw.len.eq(0),
+            axi.aw.size.eq(adr_shift),
+            If(axi.aw.valid & axi.aw.ready,
+                NextValue(_cmd_done, 1)
+            ),
+            # data
+            axi.w.valid.eq(~_data_done),
+            axi.w.last.eq(1),
+            axi.w.data.eq(wishbone.dat_w),
+            axi.w.strb.eq(wishbone.sel),
+            If(axi.w.valid & axi.w.ready,
+                NextValue(_data_done, 1),
+            ),
+            # resp
+            axi.b.ready.eq(_cmd_done & _data_done),
+            If(axi.b.valid & axi.b.ready,
+                If(axi.b.resp == RESP_OKAY,
+                    wishbone.ack.eq(1),
+                    NextState("IDLE")
+                ).Else(
+                    NextState("ERROR")
+                )
+            )
+        )
+        fsm.act("READ",
+            # cmd
+            axi.ar.valid.eq(~_cmd_done),
+            axi.ar.addr[adr_shift:].eq(_addr),
+            axi.ar.burst.eq(BURST_INCR),
+            axi.ar.len.eq(burst_beats - 1),
+            axi.ar.size.eq(adr_shift),
+            If(axi.ar.valid & axi.ar.ready,
+                NextValue(_cmd_done, 1)
+            ),
+            # data
+            axi.r.ready.eq(_cmd_done),
+            If(axi.r.valid & axi.r.ready,
+                NextValue(buf_level, buf_level + 1),
+                If(axi.r.resp != RESP_OKAY,
+                    NextValue(_bad_resp, 1)
+                ),
+                If(axi.r.last,
+                    If(_bad_resp | (axi.r.resp != RESP_OKAY),
+                        NextValue(buf_level, 0),
+                        NextState("ERROR")
+                    ).Else(
+                        NextState("READ-ACK")
+                    )
+                )
+            )
+        )
+        self.sync += [
+            If(fsm.ongoing("READ") & axi.r.valid & axi.r.ready,
+                buf_datas[buf_level].eq(axi.r.data)
+            )
+        ]
+        fsm.act("READ-ACK",
+            # The requested word is the first beat of the burst.
+            wishbone.dat_r.eq(buf_datas[0]),
+            wishbone.ack.eq(1),
+            NextState("IDLE")
+        )
+        fsm.act("WRITE-COLLECT",
+            If(wbuf_level == wbuf_cap,
+                NextState("WRITE-FLUSH")
+            ).Elif(wishbone.stb & wishbone.cyc,
+                If(wishbone.we & (wishbone.adr == (wbuf_adr + wbuf_level)),
+                    wishbone.ack.eq(1),
+                    wbuf_we.eq(1),
+                    NextValue(wbuf_level, wbuf_level + 1),
+                    NextValue(_timeout, 0)
+                ).Else(
+                    # Non-contiguous access or read: flush first, the access is served after.
+                    NextState("WRITE-FLUSH")
+                )
+            ).Else(
+                NextValue(_timeout, _timeout + 1),
+                If(_timeout == (coalesce_timeout - 1),
+                    NextState("WRITE-FLUSH")
+                )
+            )
+        )
+        _wflush_addr = Signal(len(wishbone.adr))
+        self.comb += _wflush_addr.eq(wbuf_adr - (base_address >> adr_shift))
+        fsm.act("WRITE-FLUSH",
+            # cmd
+            axi.aw.valid.eq(~_cmd_done),
+            axi.aw.addr[adr_shift:].eq(_wflush_addr),
+            axi.aw.burst.eq(BURST_INCR),
+            axi.aw.len.eq(wbuf_level - 1),
+            axi.aw.size.eq(adr_shift),
+            If(axi.aw.valid & axi.aw.ready,
+                NextValue(_cmd_done, 1)
+            ),
+            # data
+            axi.w.valid.eq(~_data_done),
+            axi.w.last.eq(wflush_beat == (wbuf_level - 1)),
+            axi.w.data.eq(wbuf_datas[wflush_beat]),
+            axi.w.strb.eq(wbuf_sels[wflush_beat]),
+            If(axi.w.valid & axi.w.ready,
+                NextValue(wflush_beat, wflush_beat + 1),
+                If(axi.w.last,
+                    NextValue(_data_done, 1)
+                )
+            ),
+            # resp (the writes were acked when posted, so a bad response can't be reported)
+            axi.b.ready.eq(_cmd_done & _data_done),
+            If(axi.b.valid & axi.b.ready,
+                NextValue(wbuf_level,  0),
+                NextValue(wflush_beat, 0),
+                NextState("IDLE")
+            )
+        )
+        fsm.act("ERROR",
+            wishbone.ack.eq(1),
+            wishbone.err.eq(1),
+            NextState("IDLE")
+        )
@@ -139,9 +139,9 @@ class EventManager(Module, AutoCSR):
         sources_u = [v for k, v in xdir(self, True) if isinstance(v, _EventSource)]
         sources = sorted(sources_u, key=lambda x: x.duid)
         n = len(sources)
-        self.status = CSR(n)
-        self.pending = CSR(n)
-        self.enable = CSRStorage(n)
+        self.status  = CSR(n, name="status")
+        self.pending = CSR(n, name="pending")
+        self.enable  = CSRStorage(n, name="enable")
 
         for i, source in enumerate(sources):
             self.comb += [
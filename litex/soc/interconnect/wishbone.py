@@ -33,14 +33,29 @@ _layout = [
 ]
 
 
+# Resolved layouts, memoized by (data_width, adr_width): bridges/converters build many
+# identically-dimensioned Interfaces and the parameter substitution only has to run once per
+# dimension set.
+_resolved_layouts = {}
+
+def _resolve_layout(data_width, adr_width):
+    key = (data_width, adr_width)
+    try:
+        return _resolved_layouts[key]
+    except KeyError:
+        layout = set_layout_parameters(_layout,
+            adr_width  = adr_width,
+            data_width = data_width,
+            sel_width  = data_width//8)
+        _resolved_layouts[key] = layout
+        return layout
+
+
 class Interface(Record):
     def __init__(self, data_width=32, adr_width=30):
         self.data_width = data_width
         self.adr_width  = adr_width
-        Record.__init__(self, set_layout_parameters(_layout,
-            adr_width  = adr_width,
-            data_width = data_width,
-            sel_width  = data_width//8))
+        Record.__init__(self, _resolve_layout(data_width, adr_width))
         self.adr.reset_less   = True
         self.dat_w.reset_less = True
         self.dat_r.reset_less = True
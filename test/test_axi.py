@@ -7,6 +7,7 @@ import random
 from migen import *
 
 from litex.soc.interconnect.axi import *
+from litex.soc.interconnect import csr_bus
 from litex.soc.interconnect import wishbone
 
 # Software Models ----------------------------------------------------------------------------------
@@ -115,7 +116,7 @@ class TestAXI(unittest.TestCase):
 
 
     def _test_axi2wishbone(self,
-        naccesses=16, simultaneous_writes_reads=False,
+        naccesses=16, simultaneous_writes_reads=False, bursting=False,
         # random: 0: min (no random), 100: max.
         # burst randomness
         id_rand_enable   = False,
@@ -239,7 +240,7 @@ class TestAXI(unittest.TestCase):
                 self.axi      = AXIInterface(data_width=32, address_width=32, id_width=8)
                 self.wishbone = wishbone.Interface(data_width=32)
 
-                axi2wishbone = AXI2Wishbone(self.axi, self.wishbone)
+                axi2wishbone = AXI2Wishbone(self.axi, self.wishbone, bursting=bursting)
                 self.submodules += axi2wishbone
 
                 wishbone_mem = wishbone.SRAM(1024, bus=self.wishbone)
@@ -312,6 +313,25 @@ class TestAXI(unittest.TestCase):
     def test_axi2wishbone_random_r_valid(self):
         self._test_axi2wishbone(r_valid_random=90)
 
+    # bursting (CTI/BTE annotated) variant
+    def test_axi2wishbone_bursting_writes_then_reads_no_random(self):
+        self._test_axi2wishbone(simultaneous_writes_reads=False, bursting=True)
+
+    def test_axi2wishbone_bursting_random_all(self):
+        self._test_axi2wishbone(
+            simultaneous_writes_reads = False,
+            bursting        = True,
+            id_rand_enable  = True,
+            len_rand_enable = True,
+            aw_valid_random = 50,
+            w_ready_random  = 50,
+            b_ready_random  = 50,
+            w_valid_random  = 50,
+            ar_valid_random = 90,
+            r_valid_random  = 90,
+            r_ready_random  = 90
+        )
+
     # now let's stress things a bit... :)
     def test_axi2wishbone_random_all(self):
         self._test_axi2wishbone(
@@ -327,6 +347,319 @@ class TestAXI(unittest.TestCase):
             r_ready_random  = 90
         )
 
+    def test_axi_up_converter(self):
+        class DUT(Module):
+            def __init__(self):
+                self.axi = AXIInterface(data_width=32, address_width=32, id_width=4)
+
+                # # #
+
+                axi_converted = AXIInterface(data_width=64, address_width=32, id_width=4)
+                wb            = wishbone.Interface(data_width=64, adr_width=29)
+
+                up_converter = AXIUpConverter(self.axi, axi_converted)
+                axi2wishbone = AXI2Wishbone(axi_converted, wb)
+                self.submodules += up_converter, axi2wishbone
+
+                wishbone_mem = wishbone.SRAM(1024, bus=wb)
+                self.submodules += wishbone_mem
+
+        def generator(axi_port):
+            self.errors = 0
+            datas = [0x12345678 + i for i in range(8)]
+            # write burst of 8x32-bit (converted to 4x64-bit)
+            yield axi_port.aw.valid.eq(1)
+            yield axi_port.aw.addr.eq(0)
+            yield axi_port.aw.burst.eq(BURST_INCR)
+            yield axi_port.aw.len.eq(8-1)
+            yield axi_port.aw.size.eq(log2_int(32//8))
+            yield
+            while (yield axi_port.aw.ready) == 0:
+                yield
+            yield axi_port.aw.valid.eq(0)
+            yield axi_port.w.strb.eq(2**(32//8) - 1)
+            for i, data in enumerate(datas):
+                yield axi_port.w.valid.eq(1)
+                yield axi_port.w.last.eq(i == (len(datas) - 1))
+                yield axi_port.w.data.eq(data)
+                yield
+                while (yield axi_port.w.ready) == 0:
+                    yield
+                yield axi_port.w.valid.eq(0)
+            yield axi_port.b.ready.eq(1)
+            while (yield axi_port.b.valid) == 0:
+                yield
+            yield axi_port.b.ready.eq(0)
+            # read burst of 8x32-bit (converted to 4x64-bit)
+            yield axi_port.ar.valid.eq(1)
+            yield axi_port.ar.addr.eq(0)
+            yield axi_port.ar.burst.eq(BURST_INCR)
+            yield axi_port.ar.len.eq(8-1)
+            yield axi_port.ar.size.eq(log2_int(32//8))
+            yield
+            while (yield axi_port.ar.ready) == 0:
+                yield
+            yield axi_port.ar.valid.eq(0)
+            yield axi_port.r.ready.eq(1)
+            for i, data in enumerate(datas):
+                while (yield axi_port.r.valid) == 0:
+                    yield
+                if (yield axi_port.r.data) != data:
+                    self.errors += 1
+                if (yield axi_port.r.last) != (i == (len(datas) - 1)):
+                    self.errors += 1
+                yield
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut.axi)])
+        self.assertEqual(self.errors, 0)
+
+    def _test_wishbone2axi2wishbone_full(self, burst_len, write_burst_len=1):
+        class DUT(Module):
+            def __init__(self):
+                self.wishbone = wishbone.Interface(data_width=32)
+
+                # # #
+
+                axi_bus = AXIInterface(data_width=32, address_width=32)
+                wb      = wishbone.Interface(data_width=32)
+
+                wishbone2axi = Wishbone2AXI(self.wishbone, axi_bus,
+                    burst_len       = burst_len,
+                    write_burst_len = write_burst_len)
+                axi2wishbone = AXI2Wishbone(axi_bus, wb)
+                self.submodules += wishbone2axi, axi2wishbone
+
+                sram = wishbone.SRAM(1024, init=[0x12345678, 0xa55aa55a])
+                self.submodules += sram
+                self.comb += wb.connect(sram.bus)
+
+        def generator(dut):
+            dut.errors = 0
+            if (yield from dut.wishbone.read(0)) != 0x12345678:
+                dut.errors += 1
+            if (yield from dut.wishbone.read(1)) != 0xa55aa55a:
+                dut.errors += 1
+            for i in range(32):
+                yield from dut.wishbone.write(i, i)
+            # sequential reads (hitting the coalescing buffer when burst_len > 1)
+            for i in range(32):
+                if (yield from dut.wishbone.read(i)) != i:
+                    dut.errors += 1
+            # non-sequential reads
+            for i in reversed(range(32)):
+                if (yield from dut.wishbone.read(i)) != i:
+                    dut.errors += 1
+            # read/write interleaving invalidates the buffer
+            yield from dut.wishbone.write(2, 0xdeadbeef)
+            if (yield from dut.wishbone.read(2)) != 0xdeadbeef:
+                dut.errors += 1
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut)])
+        self.assertEqual(dut.errors, 0)
+
+    def test_wishbone2axi2wishbone_full(self):
+        self._test_wishbone2axi2wishbone_full(burst_len=1)
+
+    def test_wishbone2axi2wishbone_full_coalesced(self):
+        self._test_wishbone2axi2wishbone_full(burst_len=4)
+
+    def test_wishbone2axi2wishbone_full_write_coalesced(self):
+        self._test_wishbone2axi2wishbone_full(burst_len=1, write_burst_len=4)
+
+    def test_wishbone2axi2wishbone_full_rw_coalesced(self):
+        self._test_wishbone2axi2wishbone_full(burst_len=4, write_burst_len=4)
+
+    def test_wishbone2axi_legal_burst_signaling(self):
+        # The bridge-generated burst parameters have to stay legal AXI encodings: AxSIZE is the
+        # log2 of the byte width (not the byte width itself), single accesses use AxLEN=0 and
+        # INCR bursts.
+        class DUT(Module):
+            def __init__(self):
+                self.wishbone = wishbone.Interface(data_width=32)
+                self.axi      = AXIInterface(data_width=32, address_width=32)
+                self.submodules += Wishbone2AXI(self.wishbone, self.axi)
+
+        def generator(dut):
+            dut.errors = 0
+            yield dut.wishbone.cyc.eq(1)
+            yield dut.wishbone.stb.eq(1)
+            yield dut.wishbone.we.eq(1)
+            yield dut.wishbone.adr.eq(0x100)
+            yield dut.wishbone.sel.eq(0xf)
+            yield dut.wishbone.dat_w.eq(0x12345678)
+            yield
+            yield
+            while (yield dut.axi.aw.valid) == 0:
+                yield
+            if (yield dut.axi.aw.size) != log2_int(32//8):
+                dut.errors += 1
+            if (yield dut.axi.aw.len) != 0:
+                dut.errors += 1
+            if (yield dut.axi.aw.burst) != BURST_INCR:
+                dut.errors += 1
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut)])
+        self.assertEqual(dut.errors, 0)
+
+    def test_axi_dma_writer(self):
+        class DUT(Module):
+            def __init__(self):
+                self.axi = AXIInterface(data_width=32, address_width=32)
+                self.wb  = wishbone.Interface(data_width=32)
+                self.submodules.dma = AXIDMAWriter(self.axi, max_burst_len=4)
+                self.submodules += AXI2Wishbone(self.axi, self.wb)
+                self.submodules.mem = wishbone.SRAM(4096, bus=self.wb)
+
+        def feeder(dut, datas):
+            yield dut.dma.sink.valid.eq(1)
+            for data in datas:
+                yield dut.dma.sink.data.eq(data)
+                yield
+                while (yield dut.dma.sink.ready) == 0:
+                    yield
+            yield dut.dma.sink.valid.eq(0)
+
+        def generator(dut, transfers):
+            self.errors = 0
+            self.irqs   = 0
+            yield dut.dma.coalesce.storage.eq(2) # IRQ every 2nd completed transfer
+            for base, datas in transfers:
+                yield dut.dma.base.storage.eq(base)
+                yield dut.dma.length.storage.eq(4*len(datas))
+                yield dut.dma.enable.storage.eq(1)
+                yield
+                timeout = 0
+                while (yield dut.dma.done.status) == 0:
+                    self.irqs += (yield dut.dma.ev.done.trigger)
+                    yield
+                    timeout += 1
+                    self.assertLess(timeout, 2000)
+                self.irqs += (yield dut.dma.ev.done.trigger)
+                yield dut.dma.enable.storage.eq(0)
+                yield
+                yield
+                for i, data in enumerate(datas):
+                    if (yield dut.mem.mem[base//4 + i]) != data:
+                        self.errors += 1
+
+        # 11 words with max_burst_len=4: crosses burst-length boundaries (4+4+3 beats),
+        # then three more transfers to exercise the coalesced IRQ (4 transfers, coalesce=2).
+        transfers = [
+            (0x040, [0x10000000 + i for i in range(11)]),
+            (0x100, [0x20000000 + i for i in range(4)]),
+            (0x200, [0x30000000 + i for i in range(2)]),
+            (0x300, [0x40000000 + i for i in range(5)]),
+        ]
+        datas = sum((d for _, d in transfers), [])
+        dut = DUT()
+        run_simulation(dut, [feeder(dut, datas), generator(dut, transfers)])
+        self.assertEqual(self.errors, 0)
+        self.assertEqual(self.irqs, 2)
+
+    def test_axi_lite2csr(self):
+        class DUT(Module):
+            def __init__(self):
+                self.axi = AXILiteInterface(data_width=32, address_width=32)
+                self.submodules.bridge = AXILite2CSR(self.axi,
+                    csr_bus.Interface(data_width=32, address_width=12))
+                self.submodules.sram = csr_bus.SRAM(64, 0,
+                    init = [0x11111111, 0x22222222, 0x33333333],
+                    bus  = self.bridge.csr)
+
+        def axi_lite_write(axi, addr, data):
+            yield axi.aw.valid.eq(1)
+            yield axi.aw.addr.eq(addr)
+            yield axi.w.valid.eq(1)
+            yield axi.w.data.eq(data)
+            yield axi.w.strb.eq(0xf)
+            yield
+            while not ((yield axi.aw.ready) and (yield axi.w.ready)):
+                yield
+            yield axi.aw.valid.eq(0)
+            yield axi.w.valid.eq(0)
+            yield axi.b.ready.eq(1)
+            while not (yield axi.b.valid):
+                yield
+            yield axi.b.ready.eq(0)
+            yield
+
+        def axi_lite_read(axi, addr, stall=0):
+            yield axi.ar.valid.eq(1)
+            yield axi.ar.addr.eq(addr)
+            yield
+            while not (yield axi.ar.ready):
+                yield
+            yield axi.ar.valid.eq(0)
+            yield
+            while not (yield axi.r.valid):
+                yield
+            # RDATA has to stay stable while RVALID is high and RREADY low.
+            first = (yield axi.r.data)
+            for i in range(stall):
+                yield
+                if (yield axi.r.data) != first:
+                    self.errors += 1
+            yield axi.r.ready.eq(1)
+            yield
+            data = (yield axi.r.data)
+            yield axi.r.ready.eq(0)
+            yield
+            return data
+
+        def generator(dut):
+            self.errors = 0
+            if (yield from axi_lite_read(dut.axi, 0x4)) != 0x22222222:
+                self.errors += 1
+            # stalled RREADY: the in-flight response must not mutate to another CSR's data
+            if (yield from axi_lite_read(dut.axi, 0x8, stall=3)) != 0x33333333:
+                self.errors += 1
+            yield from axi_lite_write(dut.axi, 0x4, 0xcafe1234)
+            if (yield from axi_lite_read(dut.axi, 0x4, stall=2)) != 0xcafe1234:
+                self.errors += 1
+            if (yield from axi_lite_read(dut.axi, 0x0)) != 0x11111111:
+                self.errors += 1
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut)])
+        self.assertEqual(self.errors, 0)
+
+    def test_axi_lite_clock_domain_crossing(self):
+        class DUT(Module):
+            def __init__(self):
+                self.wishbone = wishbone.Interface(data_width=32)
+
+                # # #
+
+                axi_sys  = AXILiteInterface(data_width=32, address_width=32)
+                axi_fast = AXILiteInterface(data_width=32, address_width=32, clock_domain="fast")
+                wb_fast  = wishbone.Interface(data_width=32)
+
+                wishbone2axi = Wishbone2AXILite(self.wishbone, axi_sys)
+                cdc          = AXILiteClockDomainCrossing(axi_sys, axi_fast)
+                axi2wishbone = ClockDomainsRenamer("fast")(AXILite2Wishbone(axi_fast, wb_fast))
+                self.submodules += wishbone2axi, cdc, axi2wishbone
+
+                sram = ClockDomainsRenamer("fast")(wishbone.SRAM(1024, init=[0x12345678]))
+                self.submodules += sram
+                self.comb += wb_fast.connect(sram.bus)
+
+        def generator(dut):
+            dut.errors = 0
+            if (yield from dut.wishbone.read(0)) != 0x12345678:
+                dut.errors += 1
+            for i in range(8):
+                yield from dut.wishbone.write(i, 0xa5a50000 + i)
+            for i in range(8):
+                if (yield from dut.wishbone.read(i)) != 0xa5a50000 + i:
+                    dut.errors += 1
+
+        dut = DUT()
+        run_simulation(dut, [generator(dut)], clocks={"sys": 10, "fast": 7})
+        self.assertEqual(dut.errors, 0)
+
     def test_wishbone2axi2wishbone(self):
         class DUT(Module):
             def __init__(self):
@@ -358,5 +691,5 @@ class TestAXI(unittest.TestCase):
                     dut.errors += 1
 
         dut = DUT()
-        run_simulation(dut, [generator(dut)], vcd_name="toto.vcd")
+        run_simulation(dut, [generator(dut)])
         self.assertEqual(dut.errors, 0)